@@ -1,9 +1,10 @@
-import json
 import sys
+import ijson
 
-with open(sys.argv[1], "r") as rf:
-    data = json.load(rf)
-
-for item in data:
-    if "ERROR" in data[item]["manual_workflow"]["result"]['value']:
-        print(item)
+# Stream one reaction at a time so memory use does not grow with the file size.
+with open(sys.argv[1], "rb") as rf:
+    for item, data in ijson.kvitems(rf, ""):
+        value = data.get("manual_workflow", {}).get("result", {}).get("value", "")
+        # Failed workflows store their result as "ERROR - <message>".
+        if isinstance(value, str) and value.startswith("ERROR"):
+            print(item)
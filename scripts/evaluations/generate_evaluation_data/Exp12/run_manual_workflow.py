@@ -1,10 +1,27 @@
-import json
-import argparse
-from chemgraph.tools.ase_tools import run_ase
-from chemgraph.tools.cheminformatics_tools import smiles_to_atomsdata, molecule_name_to_smiles
-from chemgraph.models.ase_input import ASEInputSchema
-import datetime
-import subprocess
+import os
+
+# Parallelism comes from the process pool, so keep each TBLite calculation and BLAS
+# call to one thread unless the caller configured otherwise. OpenMP and BLAS read
+# these variables when they are first loaded, so they must be set before numpy or
+# chemgraph (which imports tblite) is imported; forked workers inherit them.
+for _var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+
+import orjson  # noqa: E402
+import argparse  # noqa: E402
+import functools  # noqa: E402
+import numpy as np  # noqa: E402
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed  # noqa: E402
+from chemgraph.utils.pubchem_session import use_shared_pubchem_session  # noqa: E402
+from chemgraph.utils.tool_cache import (  # noqa: E402
+    cached_molecule_name_to_smiles,
+    cached_smiles_to_atomsdata,
+    cached_thermochemistry,
+)
+import datetime  # noqa: E402
+import subprocess  # noqa: E402
+
+JSON_DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
 
 
 def get_manual_workflow_result(
@@ -13,6 +30,8 @@ def get_manual_workflow_result(
     temperature: float = 298.15,
     pressure: float = 101325,
     calculator: dict = {},
+    record_tool_calls: bool = True,
+    species_workers: int = 1,
 ):
     """
     Evaluate a reaction thermochemical property (e.g., enthalpy change).
@@ -24,38 +43,55 @@ def get_manual_workflow_result(
         temperature (float): Temperature in Kelvin.
         pressure (float): Pressure in Pascals.
         calculator (dict): Optional ASE calculator parameters.
+        record_tool_calls (bool): Whether to log the tool calls in the workflow.
+        species_workers (int): Number of species in a reaction evaluated concurrently.
 
     Returns:
         dict: Workflow results with tool call logs and the computed reaction property.
     """
 
-    def process_species(species_list, sign):
-        total = 0
-        for species in species_list:
-            name = species["name"]
-            coeff = species["coefficient"]
-
-            smiles = molecule_name_to_smiles.invoke({"name": name})
-            atomsdata = smiles_to_atomsdata.invoke({"smiles": smiles})
-
-            input_dict = {
-                "atomsdata": atomsdata,
-                "driver": "thermo",
-                "calculator": calculator,
-                "temperature": temperature,
-            }
-
-            params = ASEInputSchema(**input_dict)
-            aseoutput = run_ase.invoke({"params": params})
-
-            workflow["tool_calls"].extend([
-                {"molecule_name_to_smiles": {"name": name}},
-                {"smiles_to_atomsdata": {"smiles": smiles}},
-                {"run_ase": {"params": {**input_dict, "atomsdata": atomsdata.model_dump()}}},
-            ])
+    def run_species(name):
+        smiles = cached_molecule_name_to_smiles(name)
+
+        # Thermochemistry is cached on disk per (SMILES, calculator, conditions).
+        thermochemistry = cached_thermochemistry(smiles, calculator, temperature, pressure=pressure)
+        value = thermochemistry[prop]
+
+        if not record_tool_calls:
+            return [], value
+
+        atomsdata = cached_smiles_to_atomsdata(smiles)
+        input_dict = {
+            "atomsdata": atomsdata.model_dump(),
+            "driver": "thermo",
+            "calculator": calculator,
+            "temperature": temperature,
+        }
+        tool_calls = [
+            {"molecule_name_to_smiles": {"name": name}},
+            {"smiles_to_atomsdata": {"smiles": smiles}},
+            {"run_ase": {"params": input_dict}},
+        ]
+        return tool_calls, value
 
-            total += sign * aseoutput.thermochemistry[prop] * coeff
-        return total
+    def process_species(species_list, sign):
+        names = [species["name"] for species in species_list]
+        # Species are independent; optionally run them concurrently, keeping the
+        # log in input order.
+        if species_workers > 1 and len(names) > 1:
+            with ThreadPoolExecutor(max_workers=min(species_workers, len(names))) as executor:
+                results = list(executor.map(run_species, names))
+        else:
+            results = [run_species(name) for name in names]
+
+        species_logs = []
+        for tool_calls, _ in results:
+            species_logs += tool_calls
+        workflow["tool_calls"] += species_logs
+
+        values = np.array([value for _, value in results], dtype=float)
+        coeffs = np.array([species["coefficient"] for species in species_list], dtype=float)
+        return sign * float(np.dot(values, coeffs))
 
     workflow = {
         "tool_calls": [],
@@ -73,6 +109,13 @@ def get_manual_workflow_result(
         return workflow
 
 
+@functools.lru_cache(maxsize=8)
+def _load_reactions(path: str, mtime: float) -> list:
+    """Parse a reactions dataset, cached on its path and modification time."""
+    with open(path, "rb") as rf:
+        return orjson.loads(rf.read())
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Run manual workflow for thermochemical property calculations."
@@ -80,7 +123,7 @@ def main():
     parser.add_argument(
         "--reaction_fp",
         type=str,
-        default="reactions_dataset.json",
+        default="reaction_dataset.json",
         help="Path to the reactions dataset file.",
     )
     parser.add_argument(
@@ -92,36 +135,68 @@ def main():
         default="manual_workflow.json",
         help="Path to save the output workflow results.",
     )
+    parser.add_argument(
+        "--n_workers",
+        type=int,
+        default=None,
+        help="Number of reactions to evaluate in parallel (default: CPUs // species_workers).",
+    )
+    parser.add_argument(
+        "--species_workers",
+        type=int,
+        default=1,
+        help="Number of species per reaction evaluated concurrently in each worker.",
+    )
     args = parser.parse_args()
+    # Keep the total number of concurrent calculations within the CPU count.
+    n_workers = args.n_workers or max(1, (os.cpu_count() or 1) // args.species_workers)
+
+    # Reuse HTTP connections for the PubChem name lookups. Installed before the
+    # process pool starts so forked workers inherit it.
+    use_shared_pubchem_session()
 
     combined_data = {}
-    with open("reaction_dataset.json", "r") as rf:
-        reactions = json.load(rf)
+    reactions = _load_reactions(args.reaction_fp, os.path.getmtime(args.reaction_fp))
 
-    for idx, reaction in enumerate(reactions[: args.n_reactions]):
-        name = reaction["reaction_name"]
-        calculator = {"calculator_type": "TBLite", "method": "GFN2-xTB"}
-        # calculator = {"calculator_type": "mace_mp"}
-        manual_workflow = get_manual_workflow_result(
-            reaction, calculator=calculator, temperature=400
+    calculator = {"calculator_type": "TBLite", "method": "GFN2-xTB"}
+    # calculator = {"calculator_type": "mace_mp"}
+
+    # Get run-level metadata once; neither value changes between reactions.
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    try:
+        git_commit = (
+            subprocess.check_output(["git", "rev-parse", "HEAD"]).decode("utf-8").strip()
         )
-        combined_data[name] = {"manual_workflow": manual_workflow}
-
-        # Get metadata
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        try:
-            git_commit = (
-                subprocess.check_output(["git", "rev-parse", "HEAD"]).decode("utf-8").strip()
-            )
-        except subprocess.CalledProcessError:
-            git_commit = "unknown"
-
-        metadata = {"timestamp": timestamp, "git_commit": git_commit}
+    except subprocess.CalledProcessError:
+        git_commit = "unknown"
+    metadata = {"timestamp": timestamp, "git_commit": git_commit}
+
+    # Reactions are independent, so evaluate them in separate processes.
+    selected_reactions = reactions[: args.n_reactions]
+    manual_workflows = {}
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        futures = {
+            executor.submit(
+                get_manual_workflow_result,
+                reaction,
+                calculator=calculator,
+                temperature=400,
+                species_workers=args.species_workers,
+            ): idx
+            for idx, reaction in enumerate(selected_reactions)
+        }
+        for future in as_completed(futures):
+            manual_workflows[futures[future]] = future.result()
+
+    # Store results in dataset order, independent of completion order.
+    for idx, reaction in enumerate(selected_reactions):
+        name = reaction["reaction_name"]
+        combined_data[name] = {"manual_workflow": manual_workflows[idx]}
         combined_data[name]["metadata"] = metadata
 
     # Save the results to a JSON file
-    with open(args.output_fp, "w") as f:
-        json.dump(combined_data, f, indent=4)
+    with open(args.output_fp, "wb") as f:
+        f.write(orjson.dumps(combined_data, option=JSON_DUMP_OPTIONS))
 
 
 if __name__ == "__main__":
@@ -1,15 +1,38 @@
-import json
+import orjson
 import argparse
 from chemgraph.tools.ase_tools import (
     run_ase,
     save_atomsdata_to_file,
 )
-from chemgraph.tools.cheminformatics_tools import molecule_name_to_smiles, smiles_to_atomsdata
+from chemgraph.utils.pubchem_session import use_shared_pubchem_session
+from chemgraph.utils.tool_cache import (
+    cached_molecule_name_to_smiles,
+    cached_smiles_to_atomsdata,
+    cached_thermochemistry,
+)
 from chemgraph.models.ase_input import ASEInputSchema
 import datetime
 import subprocess
 import os
 
+JSON_DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _append_logs(workflow: dict, name: str, smiles: str, serialized_input: dict):
+    """Append the name -> SMILES -> AtomsData -> run_ase tool calls to a workflow log.
+
+    Args:
+        workflow (dict): workflow whose "tool_calls" list is extended.
+        name (str): a molecule name.
+        smiles (str): SMILES string resolved from the name.
+        serialized_input (dict): run_ase parameters with a serialized atomsdata.
+    """
+    workflow["tool_calls"].extend([
+        {"molecule_name_to_smiles": {"name": name}},
+        {"smiles_to_atomsdata": {"smiles": smiles}},
+        {"run_ase": {"params": serialized_input}},
+    ])
+
 
 def get_smiles_from_molecule_name(name: str) -> dict:
     """Return a workflow of converting a molecule name to a SMILES string.
@@ -25,7 +48,7 @@ def get_smiles_from_molecule_name(name: str) -> dict:
         "result": None,
     }
     try:
-        result = molecule_name_to_smiles.invoke({"name": name})
+        result = cached_molecule_name_to_smiles(name)
 
         # Populate workflow with relevant data.
         workflow["tool_calls"].append({"molecule_name_to_smiles": {"name": name}})
@@ -50,8 +73,8 @@ def get_atomsdata_from_molecule_name(name: str) -> dict:
         "result": None,
     }
     try:
-        smiles = molecule_name_to_smiles.invoke({"name": name})
-        result = smiles_to_atomsdata.invoke({"smiles": smiles})
+        smiles = cached_molecule_name_to_smiles(name)
+        result = cached_smiles_to_atomsdata(smiles)
 
         # Populate workflow with relevant data.
         workflow["tool_calls"].append({"molecule_name_to_smiles": {"name": name}})
@@ -77,13 +100,14 @@ def get_geometry_optimization_from_molecule_name(name: str, calculator: dict) ->
         "tool_calls": [],
         "result": None,
     }
-    smiles = molecule_name_to_smiles.invoke({"name": name})
-    atomsdata = smiles_to_atomsdata.invoke({"smiles": smiles})
+    smiles = cached_molecule_name_to_smiles(name)
+    atomsdata = cached_smiles_to_atomsdata(smiles)
     input_dict = {
         "atomsdata": atomsdata,
         "driver": "opt",
         "calculator": calculator,
     }
+    serialized_input = {**input_dict, "atomsdata": atomsdata.model_dump()}
     try:
         params = ASEInputSchema(**input_dict)
         aseoutput = run_ase.invoke({"params": params})
@@ -91,10 +115,7 @@ def get_geometry_optimization_from_molecule_name(name: str, calculator: dict) ->
         result = aseoutput.final_structure.model_dump()
 
         # Populate workflow with relevant data.
-        workflow["tool_calls"].append({"molecule_name_to_smiles": {"name": name}})
-        workflow["tool_calls"].append({"smiles_to_atomsdata": {"smiles": smiles}})
-        input_dict["atomsdata"] = input_dict["atomsdata"].model_dump()
-        workflow["tool_calls"].append({"run_ase": {"params": input_dict}})
+        _append_logs(workflow, name, smiles, serialized_input)
         workflow["result"] = result
 
         return workflow
@@ -117,23 +138,21 @@ def get_vibrational_frequencies_from_molecule_name(name: str, calculator: dict)
         "tool_calls": [],
         "result": {},
     }
-    smiles = molecule_name_to_smiles.invoke({"name": name})
-    atomsdata = smiles_to_atomsdata.invoke({"smiles": smiles})
+    smiles = cached_molecule_name_to_smiles(name)
+    atomsdata = cached_smiles_to_atomsdata(smiles)
     input_dict = {
         "atomsdata": atomsdata,
         "driver": "vib",
         "calculator": calculator,
     }
+    serialized_input = {**input_dict, "atomsdata": atomsdata.model_dump()}
     try:
         params = ASEInputSchema(**input_dict)
         aseoutput = run_ase.invoke({"params": params})
 
         result = aseoutput.vibrational_frequencies['frequencies']
         # Populate workflow with relevant data.
-        workflow["tool_calls"].append({"molecule_name_to_smiles": {"name": name}})
-        workflow["tool_calls"].append({"smiles_to_atomsdata": {"smiles": smiles}})
-        input_dict["atomsdata"] = input_dict["atomsdata"].model_dump()
-        workflow["tool_calls"].append({"run_ase": {"params": input_dict}})
+        _append_logs(workflow, name, smiles, serialized_input)
         workflow["result"]["frequency_cm1"] = result
         return workflow
     except Exception as e:
@@ -155,33 +174,27 @@ def get_gibbs_energy_from_molecule_name(name: str, calculator: dict, temperature
         "tool_calls": [],
         "result": {},
     }
-    smiles = molecule_name_to_smiles.invoke({"name": name})
-    atomsdata = smiles_to_atomsdata.invoke({"smiles": smiles})
+    smiles = cached_molecule_name_to_smiles(name)
+    atomsdata = cached_smiles_to_atomsdata(smiles)
     input_dict = {
         "atomsdata": atomsdata,
         "driver": "thermo",
         "calculator": calculator,
         "temperature": temperature,
     }
+    serialized_input = {**input_dict, "atomsdata": atomsdata.model_dump()}
     try:
-        params = ASEInputSchema(**input_dict)
-        aseoutput = run_ase.invoke({"params": params})
+        thermochemistry = cached_thermochemistry(smiles, calculator, temperature)
 
-        result = aseoutput.thermochemistry['gibbs_free_energy']
+        result = thermochemistry['gibbs_free_energy']
         # Populate workflow with relevant data.
-        workflow["tool_calls"].append({"molecule_name_to_smiles": {"name": name}})
-        workflow["tool_calls"].append({"smiles_to_atomsdata": {"smiles": smiles}})
-        input_dict["atomsdata"] = input_dict["atomsdata"].model_dump()
-        workflow["tool_calls"].append({"run_ase": {"params": input_dict}})
+        _append_logs(workflow, name, smiles, serialized_input)
         workflow["result"]["value"] = result
         workflow["result"]["property"] = "Gibbs free energy"
         workflow["result"]["unit"] = "eV"
         return workflow
     except Exception as e:
-        workflow["tool_calls"].append({"molecule_name_to_smiles": {"name": name}})
-        workflow["tool_calls"].append({"smiles_to_atomsdata": {"smiles": smiles}})
-        input_dict["atomsdata"] = input_dict["atomsdata"].model_dump()
-        workflow["tool_calls"].append({"run_ase": {"params": input_dict}})
+        _append_logs(workflow, name, smiles, serialized_input)
         workflow["result"] = f"ERROR - {str(e)}"
         return workflow
 
@@ -203,27 +216,28 @@ def get_saved_file_from_molecule_name(
         "tool_calls": [],
         "result": None,
     }
-    smiles = molecule_name_to_smiles.invoke({"name": name})
-    atomsdata = smiles_to_atomsdata.invoke({"smiles": smiles})
+    smiles = cached_molecule_name_to_smiles(name)
+    atomsdata = cached_smiles_to_atomsdata(smiles)
     input_dict = {
         "atomsdata": atomsdata,
         "driver": "opt",
         "calculator": calculator,
     }
+    serialized_input = {**input_dict, "atomsdata": atomsdata.model_dump()}
     try:
         params = ASEInputSchema(**input_dict)
         aseoutput = run_ase.invoke({"params": params})
 
         os.makedirs(output_path, exist_ok=True)
-        opt_atomsdata = aseoutput.final_structure.model_dump()
         filepath = os.path.join(output_path, name + '.xyz')
 
-        result = save_atomsdata_to_file.invoke({"atomsdata": opt_atomsdata, "fname": filepath})
+        # The tool accepts the AtomsData model directly; only the log needs a dict.
+        result = save_atomsdata_to_file.invoke(
+            {"atomsdata": aseoutput.final_structure, "fname": filepath}
+        )
+        opt_atomsdata = aseoutput.final_structure.model_dump()
         # Populate workflow with relevant data.
-        workflow["tool_calls"].append({"molecule_name_to_smiles": {"name": name}})
-        workflow["tool_calls"].append({"smiles_to_atomsdata": {"smiles": smiles}})
-        input_dict["atomsdata"] = input_dict["atomsdata"].model_dump()
-        workflow["tool_calls"].append({"run_ase": {"params": input_dict}})
+        _append_logs(workflow, name, smiles, serialized_input)
         workflow["tool_calls"].append({
             "save_atomsdata_to_file": {"atomsdata": opt_atomsdata, "fname": filepath}
         })
@@ -243,12 +257,25 @@ def main(fname: str, n_structures: int):
         fname (str): Path to the JSON file containing SMILES data.
         n_structures (int): Number of molecules to process from the dataset.
     """
+    # Reuse HTTP connections for the PubChem name lookups.
+    use_shared_pubchem_session()
+
     # Load SMILES data from the specified JSON file
-    with open(fname, "r") as f:
-        smiles_data = json.load(f)
+    with open(fname, "rb") as f:
+        smiles_data = orjson.loads(f.read())
 
     combined_data = {}
 
+    # Get run-level metadata once; neither value changes between molecules.
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    try:
+        git_commit = (
+            subprocess.check_output(["git", "rev-parse", "HEAD"]).decode("utf-8").strip()
+        )
+    except subprocess.CalledProcessError:
+        git_commit = "unknown"
+    metadata = {"timestamp": timestamp, "git_commit": git_commit}
+
     # Iterate through the first n_structures molecules
     for idx, molecule in enumerate(smiles_data[:n_structures]):
         name = molecule["name"]
@@ -264,21 +291,11 @@ def main(fname: str, n_structures: int):
 
         # Store results in a structured dictionary
         combined_data[name] = {"manual_workflow": manual_workflow}
-
-        # Get metadata
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        try:
-            git_commit = (
-                subprocess.check_output(["git", "rev-parse", "HEAD"]).decode("utf-8").strip()
-            )
-        except subprocess.CalledProcessError:
-            git_commit = "unknown"
-
-        metadata = {"timestamp": timestamp, "git_commit": git_commit}
         combined_data[name]["metadata"] = metadata
+
     # Save the results to a JSON file
-    with open("manual_workflow.json", "w") as f:
-        json.dump(combined_data, f, indent=4)
+    with open("manual_workflow.json", "wb") as f:
+        f.write(orjson.dumps(combined_data, option=JSON_DUMP_OPTIONS))
 
 
 if __name__ == "__main__":
@@ -1,9 +1,10 @@
 """Module to evaluate LLM performance on tool-calling workflows."""
 
 import pprint
-import json
+import orjson
 import datetime
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from langchain_core.utils.function_calling import convert_to_openai_function
 from chemgraph.agent.llm_agent import ChemGraph
 from chemgraph.utils.get_workflow_from_llm import get_workflow_from_state
@@ -18,10 +19,13 @@ from chemgraph.tools.ase_tools import (
     save_atomsdata_to_file,
 )
 
+JSON_DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
 
 def evaluate_model(
     model_name: str,
     input_file: str = "ground_truth_sample.json",
+    max_workers: int = 16,
 ):
     """
     Evaluate the tool-calling behavior of an LLM given a list of queries.
@@ -32,9 +36,11 @@ def evaluate_model(
         Name of the LLM model to use in ChemGraph.
     input_file : str
         Path to the ground truth sample JSON file.
+    max_workers : int
+        Maximum number of queries sent to the LLM concurrently.
     """
-    with open(input_file, "r", encoding="utf-8") as f:
-        list_of_queries = json.load(f)
+    with open(input_file, "rb") as f:
+        list_of_queries = orjson.loads(f.read())
 
     workflow_type = "mock_agent"
     cg = ChemGraph(
@@ -44,18 +50,27 @@ def evaluate_model(
         return_option="state",
     )
 
-    llm_tool_calls = []
-    for idx, item in enumerate(list_of_queries):
-        query = item["query"]
-        state = cg.run(query, {"configurable": {"thread_id": str(idx)}})
-        llm_tool_call = get_workflow_from_state(state)
-        llm_tool_calls.append(llm_tool_call)
+    # Queries are independent and dominated by LLM latency, so run them concurrently.
+    # Each query uses its own thread_id, so runs do not share checkpointed state.
+    # Messages are only logged, since pretty-printing from concurrent runs interleaves.
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(list_of_queries)))) as ex:
+        futures = [
+            ex.submit(
+                cg.run,
+                item["query"],
+                {"configurable": {"thread_id": str(idx)}},
+                verbose=False,
+            )
+            for idx, item in enumerate(list_of_queries)
+        ]
+        states = [future.result() for future in futures]
+    llm_tool_calls = [get_workflow_from_state(state) for state in states]
 
     # Save tool call results
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     output_file = f"{model_name}_{timestamp}_tool_call.json"
-    with open(output_file, "w", encoding="utf-8") as wf:
-        json.dump(llm_tool_calls, wf, indent=4)
+    with open(output_file, "wb") as wf:
+        wf.write(orjson.dumps(llm_tool_calls, option=JSON_DUMP_OPTIONS))
     print(f"Saved tool calls to {output_file}")
 
     # Evaluation
@@ -70,9 +85,9 @@ def evaluate_model(
     func_descriptions = [convert_to_openai_function(tool) for tool in toolsets]
     accurate_tool_call = 0
     eval_details = {}
-    for idx, toolcall in enumerate(llm_tool_calls):
-        model_outputs = llm_tool_calls[idx].get("tool_calls", {})
-        answers = list_of_queries[idx].get("answer", {}).get("tool_calls", {})
+    for query_item, toolcall in zip(list_of_queries, llm_tool_calls):
+        model_outputs = toolcall.get("tool_calls") or {}
+        answers = (query_item.get("answer") or {}).get("tool_calls") or {}
         eval_result = multi_function_checker_with_order(
             func_descriptions=func_descriptions,
             model_outputs=model_outputs,
@@ -80,11 +95,11 @@ def evaluate_model(
         )
         if eval_result["acc_n_toolcalls"] == eval_result["n_toolcalls"]:
             accurate_tool_call += 1
-        eval_details[list_of_queries[idx]["query"]] = eval_result
+        eval_details[query_item["query"]] = eval_result
         print(eval_result)
     accuracy = accurate_tool_call / len(llm_tool_calls) * 100
 
-    print(f"Accuracy of {model_name}: {accuracy}% ({accurate_tool_call}/10 accurate tool calls)")
+    print(f"Accuracy of {model_name}: {accuracy}% ({accurate_tool_call}/{len(llm_tool_calls)} accurate tool calls)")
 
     output_eval_file = f"{model_name}_{timestamp}_eval.txt"
 
@@ -112,9 +127,15 @@ def main():
         default="ground_truth_sample.json",
         help="Path to input JSON file of queries",
     )
+    parser.add_argument(
+        "--max_workers",
+        type=int,
+        default=16,
+        help="Maximum number of concurrent LLM queries",
+    )
 
     args = parser.parse_args()
-    evaluate_model(args.model_name, args.input_file)
+    evaluate_model(args.model_name, args.input_file, args.max_workers)
 
 
 if __name__ == "__main__":
@@ -1,14 +1,92 @@
 import pubchempy as pcp
 import random
+import threading
 import time
-import json
-from chemgraph.tools.ASE_tools import (
-    smiles_to_atomsdata,
-    molecule_name_to_smiles,
+import orjson
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import URLError
+from chemgraph.utils.pubchem_session import use_shared_pubchem_session
+from chemgraph.utils.tool_cache import (
+    cached_molecule_name_to_smiles,
+    cached_smiles_to_atomsdata,
 )
 
+JSON_DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
 
-def get_random_molecule_names(n=2, cid_range=(0, 10000000), seed=2025, max_natoms=20, min_natoms=6):
+
+class RateLimiter:
+    """Thread-safe limiter that spaces out requests to at most `rps` per second."""
+
+    def __init__(self, rps=5):
+        self.interval = 1 / rps
+        self.next = 0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next - now
+            self.next = max(now, self.next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+# PUG-REST allows about 5 requests per second per IP.
+rate_limiter = RateLimiter(rps=5)
+
+
+# Errors that make a batch or a compound unusable: PubChem/network failures, names
+# PubChem cannot resolve (IndexError) and SMILES RDKit cannot embed (ValueError).
+# Anything else is a bug and is raised.
+LOOKUP_ERRORS = (pcp.PubChemPyError, requests.RequestException, URLError, IndexError, ValueError)
+
+
+def _is_throttled(error):
+    """Return True if PubChem rejected a request because of rate limiting."""
+    return isinstance(error, pcp.PubChemHTTPError) and getattr(error, "code", None) in (429, 503)
+
+
+def _get_compounds(cids, max_retries=5):
+    """Fetch a batch of compounds, backing off exponentially when PubChem throttles."""
+    for attempt in range(max_retries):
+        rate_limiter.wait()
+        try:
+            return pcp.get_compounds(cids)
+        except pcp.PubChemHTTPError as e:
+            if not _is_throttled(e) or attempt == max_retries - 1:
+                raise
+            time.sleep(2**attempt)
+
+
+def _get_molecule_data(compound):
+    """Return (name, smiles, number of atoms) for a PubChem compound, or None if unusable."""
+    try:
+        name = compound.iupac_name
+        if not name:
+            rate_limiter.wait()
+            name = compound.synonyms[0] if compound.synonyms else None
+        if not name:
+            return None
+
+        rate_limiter.wait()
+        smiles = cached_molecule_name_to_smiles(name)
+        atomsdata = cached_smiles_to_atomsdata(smiles)
+        return name, smiles, len(atomsdata.numbers)
+    except LOOKUP_ERRORS:
+        return None
+
+
+def get_random_molecule_names(
+    n=2,
+    cid_range=(0, 10000000),
+    seed=2025,
+    max_natoms=20,
+    min_natoms=6,
+    batch_size=200,
+    max_workers=4,
+    max_candidates=20000,
+):
     """Get a list of random molecule names and smiles from PubChemPy.
 
     Args:
@@ -16,55 +94,63 @@ def get_random_molecule_names(n=2, cid_range=(0, 10000000), seed=2025, max_natom
         cid_range (tuple): Range of PubChem CIDs to sample from.
         seed (int): Random seed for reproducibility.
         natoms (int): Maximum number of atoms per molecule.
+        batch_size (int): Number of CIDs fetched from PubChem per request.
+        max_workers (int): Number of compounds converted to structures concurrently.
+        max_candidates (int): Maximum number of distinct CIDs to try.
 
     Returns:
         list: A list of dictionaries, each containing data for one molecule.
     """
     random.seed(seed)
     output = []
-    tried = set()
     count = 0
 
-    while len(output) < n:
-        cid = random.randint(*cid_range)
-        if cid in tried:
-            continue
-        tried.add(cid)
+    # Draw all candidate CIDs up front; random.sample never repeats a CID.
+    candidates = random.sample(range(*cid_range), max_candidates)
 
-        try:
-            compound = pcp.Compound.from_cid(cid)
-            name = compound.iupac_name or (compound.synonyms[0] if compound.synonyms else None)
-            if not name:
-                continue
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for start in range(0, len(candidates), batch_size):
+            if len(output) >= n:
+                break
+            cids = candidates[start : start + batch_size]
 
-            smiles = molecule_name_to_smiles.invoke({"name": name})
-            atomsdata = smiles_to_atomsdata.invoke({"smiles": smiles})
-
-            if len(atomsdata.numbers) < max_natoms and len(atomsdata.numbers) > min_natoms:
-                molecule_info = {
-                    "index": count,
-                    "name": name,
-                    "number_of_atoms": len(atomsdata.numbers),
-                    "smiles": smiles,
-                }
-                output.append(molecule_info)
-                count += 1
-                print(count)
-            else:
-                print(f"Too many atoms in {name}, skipping...")
+            # Fetch the whole batch of CIDs in a single PubChem request.
+            try:
+                compounds = _get_compounds(cids)
+            except LOOKUP_ERRORS as e:
+                print(f"Skipping batch of {len(cids)} CIDs: {e}")
+                continue
 
-        except Exception:
-            continue
+            for molecule_data in executor.map(_get_molecule_data, compounds):
+                if molecule_data is None:
+                    continue
+                name, smiles, natoms = molecule_data
 
-        time.sleep(0.5)
+                if natoms < max_natoms and natoms > min_natoms:
+                    molecule_info = {
+                        "index": count,
+                        "name": name,
+                        "number_of_atoms": natoms,
+                        "smiles": smiles,
+                    }
+                    output.append(molecule_info)
+                    count += 1
+                    print(count)
+                    if len(output) >= n:
+                        break
+                else:
+                    print(f"Too many atoms in {name}, skipping...")
 
+    if len(output) < n:
+        print(f"Only found {len(output)} molecules in {max_candidates} candidate CIDs.")
     return output
 
 
 def main():
+    use_shared_pubchem_session()
     output = get_random_molecule_names(n=60, seed=2025)
-    with open('pubchempy_molecule_max.json', 'w') as f:
-        json.dump(output, f, indent=4)
+    with open('pubchempy_molecule_max.json', 'wb') as f:
+        f.write(orjson.dumps(output, option=JSON_DUMP_OPTIONS))
 
 
 if __name__ == "__main__":
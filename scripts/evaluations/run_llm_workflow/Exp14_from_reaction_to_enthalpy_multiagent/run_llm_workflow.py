@@ -1,8 +1,14 @@
-import json
+import orjson
 from chemgraph.agent.llm_agent import ChemGraph
 from chemgraph.utils.get_workflow_from_llm import get_workflow_from_state
+from chemgraph.utils.working_directory import working_directory
 import argparse
 import datetime
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+JSON_DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
 
 
 def get_query(
@@ -32,7 +38,7 @@ def get_query(
     return query_dict.get(query_name, "Query not found")  # Returns the query or a default message
 
 
-def main(n_reactions: int):
+def main(n_reactions: int, max_workers: int = 8):
     """ """
     # Load SMILES data from the specified JSON file
     combined_data = {}
@@ -43,43 +49,66 @@ def main(n_reactions: int):
         structured_output=True,
         return_option="state",
     )
-    with open("reaction_dataset.json", "r") as rf:
-        reactions = json.load(rf)
-
-    # Iterate through the first n_structures molecules
-    for idx, reaction in enumerate(reactions[:n_reactions]):
-        print("********************************************")
-        print(
-            f"REACTION INDEX {reaction['reaction_index']}: REACTION NAME: {reaction['reaction_name']}"
-        )
-        print("********************************************")
+    with open("reaction_dataset.json", "rb") as rf:
+        reactions = orjson.loads(rf.read())
 
-        name = reaction["reaction_name"]
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    # Concurrent reactions share the process cwd; give each its own directory
+    # for calculator and vibration files.
+    workdir_root = f"llm_workflow_{timestamp}_workdirs"
+
+    # Reactions run in threads; print each banner as a unit so they do not interleave.
+    print_lock = threading.Lock()
+
+    def run_reaction(idx, reaction):
+        with print_lock:
+            print("********************************************")
+            print(
+                f"REACTION INDEX {reaction['reaction_index']}: REACTION NAME: {reaction['reaction_name']}"
+            )
+            print("********************************************")
 
         query = get_query(
             reaction, query_name="enthalpy_method", method="GFN2-xTB", temperature=400
         )
-
+        config = {"configurable": {"thread_id": str(idx)}}
         try:
-            state = cca.run(query, config={"configurable": {"thread_id": f"{str(idx)}"}})
+            with working_directory(os.path.join(workdir_root, f"reaction_{idx}")):
+                # Messages are only logged; pretty-printing from concurrent runs interleaves.
+                state = cca.run(query, config=config, verbose=False)
         except Exception as e:
-            print(e)
+            return None, None, e
 
         llm_workflow = get_workflow_from_state(state)
+        state_data = cca.write_state(config=config)
+        return llm_workflow, state_data, None
 
-        # Store results in a structured dictionary
-        state_data = cca.write_state(config={"configurable": {"thread_id": f"{str(idx)}"}})
+    # LLM calls dominate the runtime. Each reaction runs on its own thread_id, so
+    # concurrent runs do not share checkpointed state.
+    selected_reactions = reactions[:n_reactions]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(run_reaction, range(len(selected_reactions)), selected_reactions))
+
+    # Iterate through the first n_reactions reactions
+    for reaction, (llm_workflow, state_data, error) in zip(selected_reactions, results):
+        name = reaction["reaction_name"]
+        if error is not None:
+            print(error)
+            combined_data[name] = {
+                "llm_workflow": {"result": f"Error with running LLM: {error}", "tool_calls": []}
+            }
+            continue
 
+        # Store results in a structured dictionary
         combined_data[name] = {"llm_workflow": llm_workflow}
         combined_data[name]["metadata"] = state_data
 
     # Save the results to a JSON file
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     filename = f"llm_workflow_{timestamp}.json"
 
     # Save the results to a JSON file
-    with open(filename, "w") as f:
-        json.dump(combined_data, f, indent=4)
+    with open(filename, "wb") as f:
+        f.write(orjson.dumps(combined_data, option=JSON_DUMP_OPTIONS))
 
 
 if __name__ == "__main__":
@@ -88,7 +117,10 @@ if __name__ == "__main__":
     parser.add_argument(
         "--n_reactions", type=int, default=10, help="Number of molecules to process (default: 10)"
     )
+    parser.add_argument(
+        "--max_workers", type=int, default=8, help="Number of concurrent LLM runs (default: 8)"
+    )
     args = parser.parse_args()
 
     # Call the main function with parsed arguments
-    main(args.n_reactions)
+    main(args.n_reactions, args.max_workers)
@@ -0,0 +1,413 @@
+"""Shared driver for the single-molecule LLM workflow experiments (Exp3, Exp8).
+
+Each molecule in the input dataset is turned into a query from ``--field`` (its
+name or SMILES) and the ``--query`` template, and is run through a single-agent
+ChemGraph workflow. The experiment folders contain thin wrappers that call this
+module with their own defaults.
+"""
+
+import argparse
+import asyncio
+import fcntl
+import functools
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import httpx
+import orjson
+from tqdm.asyncio import tqdm
+
+from chemgraph.agent.llm_agent import ChemGraph
+from chemgraph.utils.get_workflow_from_llm import get_workflow_from_state
+from chemgraph.utils.logging_config import setup_queue_logger
+from chemgraph.utils.tool_cache import canonicalize_smiles
+from chemgraph.utils.working_directory import working_directory
+
+JSON_DUMP_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+LLM_ERROR_PREFIX = "Error with running LLM"
+
+# Retries of each LLM request on rate-limit, connection and 5xx errors. They happen
+# inside the OpenAI client, so a transient error never re-runs finished tool calls.
+LLM_MAX_RETRIES = 5
+
+_QUERY_TEMPLATES = {
+    "name_to_coord": "Provide the XYZ coordinates corresponding to this molecule: {name}",
+    "name_to_opt": "Perform geometry optimization for a molecule {name} using NWChem, PBE and sto-3g",
+    "name_to_vib": "Run vibrational frequency calculation for a molecule {name} using {method}",
+    "name_to_enthalpy": "Calculate the enthalpy of a molecule {name} using {method}",
+    "name_to_gibbs": "Calculate the Gibbs free energy of a molecule {name} using {method} potential at a temperature of 400K",
+    "name_to_opt_file": "Perform geometry optimization for a molecule {name} using {method}. Save the optimized coordinate in an XYZ file.",
+    "smiles_to_coord": "Provide the XYZ coordinates corresponding to this SMILES string: {smiles}",
+    "smiles_to_opt": "Perform geometry optimization for this SMILES string {smiles} using NWChem, B3LYP and sto-3g",
+    "smiles_to_vib": "Run vibrational frequency calculation for this SMILES string {smiles} using {method}",
+    "smiles_to_enthalpy": "Calculate the enthalpy of this SMILES string {smiles} using {method}",
+    "smiles_to_gibbs": "Calculate the Gibbs free energy of this SMILES string {smiles} using {method} at T=400K",
+    "smiles_to_opt_file": "Perform geometry optimization for this SMILES string {smiles} using {method}. Save the optimized coordinate in an XYZ file.",
+}
+
+
+def get_query(
+    molecule: str,
+    query_name: str = "smiles_to_coord",
+    method: str = "mace_mp",
+) -> str:
+    """Get query for a molecule-related task for CompChemAgent
+
+    Args:
+        molecule (str): molecule name or SMILES string, matching the query type.
+        query_name (str, optional): Type of query. Defaults to "smiles_to_coord". Options are the keys of _QUERY_TEMPLATES.
+        method (str, optional): The method/level of theory for CompChemAgent to run simulation. Defaults to "mace_mp".
+
+    Returns:
+        str: formatted query.
+    """
+    template = _QUERY_TEMPLATES.get(query_name)
+    if template is None:
+        return "Query not found"
+    return template.format(name=molecule, smiles=molecule, method=method)
+
+
+def _cache_key(model_name: str, workflow_type: str, query: str) -> str:
+    """Return the response-cache key for a query."""
+    return hashlib.sha256(f"{model_name}|{workflow_type}|{query}".encode("utf-8")).hexdigest()
+
+
+def _load_cache(cache_path: str, logger) -> dict:
+    """Load an append-only JSONL response cache into a {key: payload} dict.
+
+    Lines that cannot be parsed (e.g. truncated by a crash mid-write) are skipped with
+    a warning; those queries are simply run again.
+    """
+    cache = {}
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path, "rb") as f:
+            for lineno, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = orjson.loads(line)
+                    cache[record["key"]] = record["payload"]
+                except (orjson.JSONDecodeError, KeyError, TypeError):
+                    logger.warning("Skipping malformed line %d of cache %s", lineno, cache_path)
+    return cache
+
+
+def _append_cache(cache_file, key: str, payload: dict):
+    """Append one entry to the response cache.
+
+    The line is written in a single call under an exclusive lock, so several runs can
+    share one cache file without interleaving their entries.
+    """
+    line = orjson.dumps({"key": key, "payload": payload}, option=JSON_DUMP_OPTIONS) + b"\n"
+    fcntl.flock(cache_file, fcntl.LOCK_EX)
+    try:
+        cache_file.write(line)
+        cache_file.flush()
+    finally:
+        fcntl.flock(cache_file, fcntl.LOCK_UN)
+
+
+class LLMWorkflowError(Exception):
+    """An LLM workflow failed; carries the config of the failed run."""
+
+    def __init__(self, error: Exception, config: dict = None):
+        super().__init__(str(error))
+        self.config = config
+
+
+def _load_completed(resume_from: str) -> dict:
+    """Return the successfully completed entries of a previous run's output file."""
+    if not resume_from:
+        return {}
+    with open(resume_from, "rb") as f:
+        previous = orjson.loads(f.read())
+    return {
+        key: entry
+        for key, entry in previous.items()
+        if entry.get("metadata") not in (None, "Error")
+        and not str(entry["llm_workflow"].get("result", "")).startswith(LLM_ERROR_PREFIX)
+    }
+
+
+async def _call_llm(cca, query: str, idx: int, semaphore: asyncio.Semaphore, logger):
+    """Run one LLM workflow while holding a slot of the concurrency limit, and
+    extract the tool-call workflow from its final state.
+
+    Messages go to ``logger`` instead of being pretty-printed, so output from
+    concurrent workflows does not interleave with each other or the progress bar.
+
+    Returns:
+        tuple: the extracted workflow and the config of the run.
+
+    Raises:
+        LLMWorkflowError: if the workflow fails or its final state cannot be parsed.
+    """
+    config = {"configurable": {"thread_id": str(idx)}}
+    try:
+        async with semaphore:
+            state = await cca.arun(
+                query, config=config, verbose=False, message_logger=logger
+            )
+        # A malformed final state fails this molecule only, not the whole batch.
+        llm_workflow = get_workflow_from_state(state)
+    except Exception as e:
+        raise LLMWorkflowError(e, config) from e
+    return llm_workflow, config
+
+
+async def main(
+    fname: str,
+    n_structures: int,
+    field: str = "smiles",
+    query_name: str = "smiles_to_opt",
+    method: str = "mace_mp",
+    max_parallel: int = 16,
+    cache_path: str = None,
+    resume_from: str = None,
+    pretty: bool = False,
+):
+    """
+    Run an LLM workflow on a subset of molecules from the input dataset.
+
+    Args:
+        fname (str): Path to the JSON file containing molecule data.
+        n_structures (int): Number of molecules to process from the dataset.
+        field (str): Molecule field used to build the query and key the output, "name" or "smiles".
+        query_name (str): Query template to run, e.g. "name_to_opt" or "smiles_to_opt".
+        method (str): The method/level of theory passed to the query template.
+        max_parallel (int): Maximum number of concurrent LLM workflows.
+        cache_path (str): Optional JSONL file of completed workflows. Queries found in
+            it are not sent to the LLM again, and new results are appended to it. Runs
+            may share one cache file; appends are locked, but entries another run adds
+            later are only picked up on the next start.
+        resume_from (str): Optional output JSON of a previous run. Molecules that
+            completed there are skipped and copied into the new output.
+        pretty (bool): Indent the output JSON for human reading instead of writing it compactly.
+    """
+    template = _QUERY_TEMPLATES[query_name]
+    if f"{{{field}}}" not in template:
+        raise ValueError(f"Query '{query_name}' does not take a molecule {field}.")
+    # Bind the template once so each molecule only formats the string.
+    build_query = functools.partial(template.format, method=method)
+
+    # Load molecule data from the specified JSON file
+    with open(fname, "rb") as f:
+        smiles_data = orjson.loads(f.read())
+
+    # One pooled HTTP/2 client for every request, so concurrent workflows share
+    # connections instead of each paying for a TLS handshake.
+    http_client = httpx.AsyncClient(
+        http2=True,
+        timeout=600,
+        limits=httpx.Limits(
+            max_connections=max_parallel, max_keepalive_connections=max_parallel
+        ),
+    )
+
+    cca = ChemGraph(
+        model_name='gpt-4o-mini',
+        workflow_type="single_agent",
+        structured_output=True,
+        return_option="state",
+        http_async_client=http_client,
+        max_retries=LLM_MAX_RETRIES,
+    )
+
+    logger, listener = setup_queue_logger(__name__)
+
+    cache = _load_cache(cache_path, logger)
+    # Unbuffered, so each entry reaches the file in the single write made under the lock.
+    cache_file = open(cache_path, "ab", buffering=0) if cache_path else None
+
+    # Microseconds and the PID keep concurrent runs from overwriting each other's output.
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    filename = f"llm_workflow_{timestamp}_{os.getpid()}.json"
+
+    # Write each molecule as soon as it finishes, so a crash only loses in-flight work.
+    records_path = filename + "l"
+    # Calculator files (e.g. nwchem.nwi/nwchem.nwo, vibration caches) go to a
+    # directory per molecule, so concurrent workflows do not overwrite each other.
+    workdir_root = os.path.splitext(filename)[0] + "_workdirs"
+    records_file = open(records_path, "w", buffering=1)
+    write_lock = asyncio.Lock()
+
+    completed = _load_completed(resume_from)
+    for key, entry in completed.items():
+        record = {field: key, "llm_workflow": entry["llm_workflow"], "metadata": entry["metadata"]}
+        records_file.write(orjson.dumps(record, option=JSON_DUMP_OPTIONS).decode() + "\n")
+
+    async def write_records(group, llm_workflow, state_data):
+        async with write_lock:
+            for key in dict.fromkeys(molecule[field] for molecule in group):
+                record = {field: key, "llm_workflow": llm_workflow, "metadata": state_data}
+                records_file.write(orjson.dumps(record, option=JSON_DUMP_OPTIONS).decode() + "\n")
+
+    # Bound the number of in-flight workflows to stay within provider rate limits.
+    semaphore = asyncio.Semaphore(max_parallel)
+    # LLM calls are awaited on the shared async client, but tool nodes and write_state
+    # run in the loop's default executor, which only has min(32, cpu + 4) threads.
+    # Size it to the workflow limit so concurrency is not capped below max_parallel.
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=max_parallel)
+    )
+
+    async def process(idx, group):
+        # Molecules in a group are the same molecule; run the LLM on the first one.
+        molecule = group[0]
+        logger.info(
+            "MOLECULE SMILES: %s MOLECULE NAME: %s", molecule["smiles"], molecule["name"]
+        )
+
+        query = build_query(**{field: molecule[field]})
+        key = _cache_key(cca.model_name, cca.workflow_type, query)
+        if key in cache:
+            await write_records(group, cache[key]["llm_workflow"], cache[key]["metadata"])
+            return
+
+        with working_directory(os.path.join(workdir_root, f"molecule_{idx}")):
+            try:
+                llm_workflow, config = await _call_llm(cca, query, idx, semaphore, logger)
+            except LLMWorkflowError as e:
+                # Keep whatever the failed run left in the checkpointer for diagnosis.
+                state_data = None
+                if e.config is not None:
+                    state_data = await asyncio.to_thread(cca.write_state, config=e.config)
+                await write_records(
+                    group, {"result": f"{LLM_ERROR_PREFIX}: {e}", "tool_calls": []}, state_data
+                )
+                return
+
+            # Store results in a structured dictionary
+            state_data = await asyncio.to_thread(cca.write_state, config=config)
+
+        if cache_file is not None and state_data != "Error":
+            payload = {"llm_workflow": llm_workflow, "metadata": state_data}
+            cache[key] = payload
+            _append_cache(cache_file, key, payload)
+        await write_records(group, llm_workflow, state_data)
+
+    # Run all molecules concurrently; the LLM round-trips dominate the runtime.
+    # Each record is written by process() as soon as its molecule finishes.
+    # Duplicate molecules (same name, or same canonical SMILES) are run once and
+    # their result is written for every entry.
+    groups = {}
+    for molecule in smiles_data[:n_structures]:
+        if molecule[field] in completed:
+            continue
+        group_key = canonicalize_smiles(molecule[field]) if field == "smiles" else molecule[field]
+        groups.setdefault(group_key, []).append(molecule)
+    tasks = [
+        asyncio.create_task(process(idx, group))
+        for idx, group in enumerate(groups.values())
+    ]
+    try:
+        for task in tqdm.as_completed(tasks, total=len(tasks)):
+            await task
+    finally:
+        for task in tasks:
+            task.cancel()
+        os.fsync(records_file.fileno())
+        records_file.close()
+        if cache_file is not None:
+            cache_file.close()
+        listener.stop()
+        await http_client.aclose()
+
+    # Collate the streamed records into a single JSON file.
+    combined_data = {}
+    with open(records_path, "rb") as f:
+        for line in f:
+            record = orjson.loads(line)
+            combined_data[record[field]] = {
+                "llm_workflow": record["llm_workflow"],
+                "metadata": record["metadata"],
+            }
+
+    # Save the results to a JSON file
+    with open(filename, "wb") as f:
+        options = JSON_DUMP_OPTIONS | orjson.OPT_INDENT_2 if pretty else JSON_DUMP_OPTIONS
+        f.write(orjson.dumps(combined_data, option=options))
+
+
+def build_parser(
+    description: str = "Run an LLM workflow on a dataset of molecules.",
+    fname: str = "data_from_pubchempy.json",
+    field: str = "smiles",
+    query_name: str = "smiles_to_opt",
+) -> argparse.ArgumentParser:
+    """Build the command-line parser, with defaults for a particular experiment.
+
+    Args:
+        description (str): Description shown in the help message.
+        fname (str): Default input dataset.
+        field (str): Default molecule field, "name" or "smiles".
+        query_name (str): Default query template.
+
+    Returns:
+        argparse.ArgumentParser: parser whose arguments match the parameters of main().
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--fname",
+        type=str,
+        default=fname,
+        help="Path to the input SMILES JSON file (e.g., smiles_data.json)",
+    )
+    parser.add_argument(
+        "--n_structures", type=int, default=30, help="Number of molecules to process (default: 30)"
+    )
+    parser.add_argument(
+        "--field",
+        type=str,
+        choices=["name", "smiles"],
+        default=field,
+        help=f"Molecule field used to build the query (default: {field})",
+    )
+    parser.add_argument(
+        "--query",
+        dest="query_name",
+        type=str,
+        choices=sorted(_QUERY_TEMPLATES),
+        default=query_name,
+        help=f"Query template to run (default: {query_name})",
+    )
+    parser.add_argument(
+        "--method",
+        type=str,
+        default="mace_mp",
+        help="Method/level of theory used in the query (default: mace_mp)",
+    )
+    parser.add_argument(
+        "--max_parallel",
+        type=int,
+        default=16,
+        help="Maximum number of concurrent LLM workflows (default: 16)",
+    )
+    parser.add_argument(
+        "--cache_path",
+        type=str,
+        default=None,
+        help="JSONL cache of completed workflows used to skip them on reruns; "
+        "safe to share between concurrent runs",
+    )
+    parser.add_argument(
+        "--resume_from",
+        type=str,
+        default=None,
+        help="Output JSON of a previous run whose completed molecules are skipped",
+    )
+    parser.add_argument(
+        "--pretty", action="store_true", help="Indent the output JSON for human reading"
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    # Parse command-line arguments
+    args = build_parser().parse_args()
+
+    # Call the main function with parsed arguments
+    asyncio.run(main(**vars(args)))
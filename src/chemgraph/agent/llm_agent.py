@@ -1,6 +1,7 @@
+import asyncio
 import datetime
 import os
-from chemgraph.tools.openai_loader import load_openai_model
+from chemgraph.tools.openai_loader import load_openai_model, openai_client_kwargs
 from chemgraph.tools.alcf_loader import load_alcf_model
 from chemgraph.tools.local_model_loader import load_ollama_model
 from chemgraph.tools.anthropic_loader import load_anthropic_model
@@ -94,6 +95,12 @@ class ChemGraph:
         by default "last_message"
     recursion_limit : int, optional
         Maximum number of recursive steps in the workflow, by default 50
+    http_async_client : httpx.AsyncClient, optional
+        Shared HTTP client for asynchronous requests to OpenAI and
+        OpenAI-compatible endpoints, by default None
+    max_retries : int, optional
+        Number of times a failed request to OpenAI or an OpenAI-compatible endpoint
+        is retried with exponential backoff, by default None (the client default)
 
     Raises
     ------
@@ -120,6 +127,8 @@ class ChemGraph:
         formatter_multi_prompt: str = formatter_multi_prompt,
         generate_report: bool = False,
         report_prompt: str = report_prompt,
+        http_async_client=None,
+        max_retries: int = None,
     ):
         try:
             # Use hardcoded optimal values for tool calling
@@ -134,7 +143,11 @@ class ChemGraph:
                 or model_name in supported_argo_models
             ):
                 llm = load_openai_model(
-                    model_name=model_name, temperature=temperature, base_url=base_url
+                    model_name=model_name,
+                    temperature=temperature,
+                    base_url=base_url,
+                    http_async_client=http_async_client,
+                    max_retries=max_retries,
                 )
             elif model_name in supported_ollama_models:
                 llm = load_ollama_model(model_name=model_name, temperature=temperature)
@@ -173,6 +186,7 @@ class ChemGraph:
                         temperature=temperature,
                         base_url=vllm_base_url,
                         api_key=vllm_api_key,
+                        **openai_client_kwargs(http_async_client, max_retries),
                         max_tokens=max_tokens,
                         top_p=top_p,
                         frequency_penalty=frequency_penalty,
@@ -394,7 +408,61 @@ class ChemGraph:
             print("Error with write_state: ", str(e))
             return "Error"
 
-    def run(self, query: str, config=None):
+    _SUPPORTED_WORKFLOWS = {
+        "single_agent",
+        "graspa",
+        "python_relp",
+        "mock_agent",
+        "multi_agent",
+    }
+
+    def _prepare_run(self, config):
+        """Validate the workflow type and fill in the run config shared by run and arun."""
+        if config is None:
+            config = {}
+        if not isinstance(config, dict):
+            raise TypeError(f"`config` must be a dictionary, got {type(config).__name__}")
+        config.setdefault("configurable", {}).setdefault("thread_id", "1")
+        config["recursion_limit"] = self.recursion_limit
+
+        if self.workflow_type not in self._SUPPORTED_WORKFLOWS:
+            logger.error(
+                f"Workflow {self.workflow_type} is not supported. Please select either multi_agent_ase or single_agent_ase"
+            )
+            raise ValueError(f"Workflow {self.workflow_type} is not supported")
+        return config
+
+    def _report_message(self, s, prev_messages, verbose=True, message_logger=None):
+        """Print and log the newest message of a streamed state; return the messages seen so far."""
+        if "messages" in s and s["messages"] != prev_messages:
+            new_message = s["messages"][-1]
+            if verbose:
+                new_message.pretty_print()
+            (message_logger or logger).info(new_message)
+            return s["messages"]
+        return prev_messages
+
+    @staticmethod
+    def _new_log_path():
+        """Create a fresh log directory and return the path of its state file."""
+        import uuid
+
+        log_dir = os.path.join("logs", str(uuid.uuid4()))
+        os.makedirs(log_dir, exist_ok=True)
+        return os.path.join(log_dir, "state.json")
+
+    def _build_result(self, s, config):
+        """Return the final streamed state in the form selected by return_option."""
+        if self.return_option == "last_message":
+            return s["messages"][-1]
+        elif self.return_option == "state":
+            return serialize_state(self.get_state(config=config))
+        else:
+            raise ValueError(
+                f"Return option {self.return_option} is not supported. Only supports 'last_message' or 'state'."
+            )
+
+    def run(self, query: str, config=None, verbose=True, message_logger=None):
         """Run the specified workflow with the given query.
 
         Parameters
@@ -403,6 +471,11 @@ class ChemGraph:
             The user's input query
         config : dict, optional
             Configuration dictionary for the workflow run, by default None
+        verbose : bool, optional
+            Pretty-print each new message to stdout, by default True
+        message_logger : logging.Logger, optional
+            Logger that receives each new message, by default the chemgraph logger
+            of this module
 
         Returns
         -------
@@ -420,77 +493,77 @@ class ChemGraph:
         Exception
             If there is an error running the workflow
         """
-        import uuid
-
         try:
-            if config is None:
-                config = {}
-            if not isinstance(config, dict):
-                raise TypeError(
-                    f"`config` must be a dictionary, got {type(config).__name__}"
+            config = self._prepare_run(config)
+            inputs = {"messages": query}
+            prev_messages = []
+
+            for s in self.workflow.stream(inputs, stream_mode="values", config=config):
+                prev_messages = self._report_message(
+                    s, prev_messages, verbose=verbose, message_logger=message_logger
                 )
-            config.setdefault("configurable", {}).setdefault("thread_id", "1")
-            config["recursion_limit"] = self.recursion_limit
-
-            # Construct the workflow graph
-            workflow = self.workflow
-
-            if self.workflow_type in {"single_agent", "graspa", "python_relp", "mock_agent"}:
-                inputs = {"messages": query}
-
-                prev_messages = []
-
-                for s in workflow.stream(inputs, stream_mode="values", config=config):
-                    if "messages" in s and s["messages"] != prev_messages:
-                        new_message = s["messages"][-1]
-                        new_message.pretty_print()
-                        logger.info(new_message)
-                        prev_messages = s["messages"]
-                log_id = str(uuid.uuid4())
-                log_dir = os.path.join("logs", log_id)
-                os.makedirs(log_dir, exist_ok=True)
-                log_path = os.path.join(log_dir, "state.json")
-                self.write_state(config=config, file_path=log_path)
-
-                if self.return_option == "last_message":
-                    return s["messages"][-1]
-                elif self.return_option == "state":
-                    return serialize_state(self.get_state(config=config))
-                else:
-                    raise ValueError(
-                        f"Return option {self.return_option} is not supported. Only supports 'last_message' or 'state'."
-                    )
-            elif self.workflow_type == "multi_agent":
-                inputs = {"messages": query}
-                prev_messages = []
-
-                for s in workflow.stream(inputs, stream_mode="values", config=config):
-                    if "messages" in s and s["messages"] != prev_messages:
-                        new_message = s["messages"][-1]
-                        new_message.pretty_print()
-                        logger.info(new_message)
-                        prev_messages = s["messages"]
-
-                log_id = str(uuid.uuid4())
-                log_dir = os.path.join("logs", log_id)
-                os.makedirs(log_dir, exist_ok=True)
-                log_path = os.path.join(log_dir, "state.json")
-                self.write_state(config=config, file_path=log_path)
-
-                if self.return_option == "last_message":
-                    return s["messages"][-1]
-                elif self.return_option == "state":
-                    return serialize_state(self.get_state(config=config))
-                else:
-                    raise ValueError(
-                        f"Return option {self.return_option} is not supported. Only supports 'last_message' or 'state'."
-                    )
 
-            else:
-                logger.error(
-                    f"Workflow {self.workflow_type} is not supported. Please select either multi_agent_ase or single_agent_ase"
+            self.write_state(config=config, file_path=self._new_log_path())
+            return self._build_result(s, config)
+
+        except Exception as e:
+            logger.error(f"Error running workflow {self.workflow_type}: {str(e)}")
+            raise
+
+    async def arun(self, query: str, config=None, verbose=True, message_logger=None):
+        """Asynchronously run the specified workflow with the given query.
+
+        Behaves like :meth:`run`, but streams the workflow with ``astream`` so that
+        many queries can be awaited concurrently (e.g. with ``asyncio.gather``).
+        Each concurrent query should use its own ``thread_id``. Pretty-printing from
+        concurrent queries interleaves on stdout; pass ``verbose=False`` and a
+        queue-based ``message_logger`` to keep the output readable.
+
+        Parameters
+        ----------
+        query : str
+            The user's input query
+        config : dict, optional
+            Configuration dictionary for the workflow run, by default None
+        verbose : bool, optional
+            Pretty-print each new message to stdout, by default True
+        message_logger : logging.Logger, optional
+            Logger that receives each new message, by default the chemgraph logger
+            of this module
+
+        Returns
+        -------
+        Any
+            The result depends on return_option:
+            - If "last_message": returns the last message from the workflow
+            - If "state": returns the complete message state
+
+        Raises
+        ------
+        TypeError
+            If config is not a dictionary
+        ValueError
+            If return_option or workflow_type is not supported
+        Exception
+            If there is an error running the workflow
+        """
+        try:
+            config = self._prepare_run(config)
+            inputs = {"messages": query}
+            prev_messages = []
+
+            async for s in self.workflow.astream(
+                inputs, stream_mode="values", config=config
+            ):
+                prev_messages = self._report_message(
+                    s, prev_messages, verbose=verbose, message_logger=message_logger
                 )
-                raise ValueError(f"Workflow {self.workflow_type} is not supported")
+
+            # write_state does blocking file and git I/O; keep it off the event loop.
+            await asyncio.to_thread(
+                self.write_state, config=config, file_path=self._new_log_path()
+            )
+            return self._build_result(s, config)
 
         except Exception as e:
             logger.error(f"Error running workflow {self.workflow_type}: {str(e)}")
@@ -1,5 +1,6 @@
 from langgraph.graph import StateGraph, START, END
 from langchain_core.messages import ToolMessage
+from langchain_core.runnables import RunnableLambda
 import json
 from langchain_openai import ChatOpenAI
 from langgraph.checkpoint.memory import MemorySaver
@@ -131,6 +132,19 @@ def ChemGraphAgent(state: State, llm: ChatOpenAI, system_prompt: str, tools=None
         Updated state containing the LLM's response
     """
 
+    llm_with_tools, messages = _chemgraph_agent_request(state, llm, system_prompt, tools)
+    return {"messages": [llm_with_tools.invoke(messages)]}
+
+
+async def aChemGraphAgent(state: State, llm: ChatOpenAI, system_prompt: str, tools=None):
+    """Asynchronous version of :func:`ChemGraphAgent`, used when the graph is run with
+    ``astream``/``ainvoke`` so the request goes through the model's async client."""
+    llm_with_tools, messages = _chemgraph_agent_request(state, llm, system_prompt, tools)
+    return {"messages": [await llm_with_tools.ainvoke(messages)]}
+
+
+def _chemgraph_agent_request(state: State, llm: ChatOpenAI, system_prompt: str, tools=None):
+    """Return the tool-bound model and the messages for a ChemGraphAgent call."""
     # Load default tools if no tool is specified.
     if tools is None:
         tools = [
@@ -145,8 +159,7 @@ def ChemGraphAgent(state: State, llm: ChatOpenAI, system_prompt: str, tools=None
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": f"{state['messages']}"},
     ]
-    llm_with_tools = llm.bind_tools(tools=tools)
-    return {"messages": [llm_with_tools.invoke(messages)]}
+    return llm.bind_tools(tools=tools), messages
 
 
 def ResponseAgent(state: State, llm: ChatOpenAI, formatter_prompt: str):
@@ -166,13 +179,26 @@ def ResponseAgent(state: State, llm: ChatOpenAI, formatter_prompt: str):
     dict
         Updated state containing the formatted response
     """
+    llm_structured_output, messages = _response_agent_request(state, llm, formatter_prompt)
+    response = llm_structured_output.invoke(messages).model_dump_json()
+    return {"messages": [response]}
+
+
+async def aResponseAgent(state: State, llm: ChatOpenAI, formatter_prompt: str):
+    """Asynchronous version of :func:`ResponseAgent`."""
+    llm_structured_output, messages = _response_agent_request(state, llm, formatter_prompt)
+    response = (await llm_structured_output.ainvoke(messages)).model_dump_json()
+    return {"messages": [response]}
+
+
+def _response_agent_request(state: State, llm: ChatOpenAI, formatter_prompt: str):
+    """Return the structured-output model and the messages for a ResponseAgent call."""
     messages = [
         {"role": "system", "content": formatter_prompt},
         {"role": "user", "content": f"{state['messages']}"},
     ]
-    llm_structured_output = llm.with_structured_output(ResponseFormatter)
-    response = llm_structured_output.invoke(messages).model_dump_json()
-    return {"messages": [response]}
+    return llm.with_structured_output(ResponseFormatter), messages
+
 
 def ReportAgent(state: State, llm: ChatOpenAI, system_prompt: str, tools=[generate_html]):
     """LLM node that generates a report from the messages.
@@ -193,7 +219,18 @@ def ReportAgent(state: State, llm: ChatOpenAI, system_prompt: str, tools=[genera
     dict
         Updated state containing the LLM's response
     """
+    llm_with_tools, messages = _report_agent_request(state, llm, system_prompt, tools)
+    return {"messages": [llm_with_tools.invoke(messages)]}
+
 
+async def aReportAgent(state: State, llm: ChatOpenAI, system_prompt: str, tools=[generate_html]):
+    """Asynchronous version of :func:`ReportAgent`."""
+    llm_with_tools, messages = _report_agent_request(state, llm, system_prompt, tools)
+    return {"messages": [await llm_with_tools.ainvoke(messages)]}
+
+
+def _report_agent_request(state: State, llm: ChatOpenAI, system_prompt: str, tools=None):
+    """Return the tool-bound model and the messages for a ReportAgent call."""
     # Load default tools if no tool is specified.
     if tools is None:
         tools = [
@@ -203,8 +240,7 @@ def ReportAgent(state: State, llm: ChatOpenAI, system_prompt: str, tools=[genera
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": f"{state['messages']}"},
     ]
-    llm_with_tools = llm.bind_tools(tools=tools)
-    return {"messages": [llm_with_tools.invoke(messages)]}
+    return llm.bind_tools(tools=tools), messages
 
 
 def construct_single_agent_graph(
@@ -253,12 +289,18 @@ def construct_single_agent_graph(
             ]
         tool_node = BasicToolNode(tools=tools)
         graph_builder = StateGraph(State)
+        # LLM nodes have a sync and an async implementation: stream() uses the
+        # former, astream() the latter, so async runs use the model's async client
+        # instead of blocking an executor thread per request.
+        chemgraph_agent = RunnableLambda(
+            lambda state: ChemGraphAgent(state, llm, system_prompt=system_prompt, tools=tools),
+            afunc=lambda state: aChemGraphAgent(
+                state, llm, system_prompt=system_prompt, tools=tools
+            ),
+        )
 
         if not structured_output:
-            graph_builder.add_node(
-                "ChemGraphAgent",
-                lambda state: ChemGraphAgent(state, llm, system_prompt=system_prompt, tools=tools),
-            )
+            graph_builder.add_node("ChemGraphAgent", chemgraph_agent)
             graph_builder.add_node("tools", tool_node)
             graph_builder.add_edge(START, "ChemGraphAgent")
 
@@ -268,7 +310,14 @@ def construct_single_agent_graph(
 
                 graph_builder.add_node(
                     "ReportAgent",
-                    lambda state: ReportAgent(state, llm, system_prompt=report_prompt, tools=[generate_html]),
+                    RunnableLambda(
+                        lambda state: ReportAgent(
+                            state, llm, system_prompt=report_prompt, tools=[generate_html]
+                        ),
+                        afunc=lambda state: aReportAgent(
+                            state, llm, system_prompt=report_prompt, tools=[generate_html]
+                        ),
+                    ),
                 )
                 graph_builder.add_conditional_edges(
                     "ChemGraphAgent",
@@ -295,14 +344,16 @@ def construct_single_agent_graph(
             logger.info("Graph construction completed")
             return graph
         else:
-            graph_builder.add_node(
-                "ChemGraphAgent",
-                lambda state: ChemGraphAgent(state, llm, system_prompt=system_prompt, tools=tools),
-            )
+            graph_builder.add_node("ChemGraphAgent", chemgraph_agent)
             graph_builder.add_node("tools", tool_node)
             graph_builder.add_node(
                 "ResponseAgent",
-                lambda state: ResponseAgent(state, llm, formatter_prompt=formatter_prompt),
+                RunnableLambda(
+                    lambda state: ResponseAgent(state, llm, formatter_prompt=formatter_prompt),
+                    afunc=lambda state: aResponseAgent(
+                        state, llm, formatter_prompt=formatter_prompt
+                    ),
+                ),
             )
             graph_builder.add_conditional_edges(
                 "ChemGraphAgent",
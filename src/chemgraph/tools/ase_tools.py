@@ -1,7 +1,11 @@
 import numpy as np
+import os
+import shutil
+import tempfile
 import time
 from langchain_core.tools import tool
 from chemgraph.models.atomsdata import AtomsData
+from chemgraph.utils.working_directory import get_working_directory, resolve_path
 from chemgraph.models.ase_input import (
     ASEInputSchema,
     ASEOutputSchema,
@@ -209,7 +213,7 @@ def save_atomsdata_to_file(atomsdata: AtomsData, fname: str = "output.xyz") -> s
             cell=atomsdata.cell,
             pbc=atomsdata.pbc,
         )
-        write(fname, atoms)
+        write(resolve_path(fname), atoms)
         return f"Successfully saved atomsdata to {fname}"
     except Exception as e:
         raise ValueError(f"Failed to save atomsdata to file: {str(e)}")
@@ -369,6 +373,11 @@ def run_ase(params: ASEInputSchema) -> ASEOutputSchema:
     driver = params.driver
     pressure = params.pressure
 
+    # File-based calculators (NWChem, ORCA) write fixed-name files to their
+    # directory; keep them inside the current workflow's working directory.
+    if "directory" in calculator:
+        calculator["directory"] = resolve_path(calculator["directory"])
+
     calc, system_info, calc_model = load_calculator(calculator)
     params.calculator = calc_model
 
@@ -452,11 +461,16 @@ def run_ase(params: ASEInputSchema) -> ASEOutputSchema:
             vib_data["frequencies"] = []
             vib_data["frequency_unit"] = "cm-1"
 
-            vib = Vibrations(atoms)
-            vib.clean()
-            vib.run()
-
-            energies = vib.get_energies()
+            # Displacement caches go to a fresh directory per call. With the default
+            # shared ./vib cache, concurrent calls in one working directory would
+            # clean or reuse each other's displacements.
+            scratch = tempfile.mkdtemp(prefix="chemgraph_vib_", dir=get_working_directory())
+            try:
+                vib = Vibrations(atoms, name=os.path.join(scratch, "vib"))
+                vib.run()
+                energies = vib.get_energies()
+            finally:
+                shutil.rmtree(scratch, ignore_errors=True)
             linear = is_linear_molecule.invoke({"atomsdata": final_structure})
 
             for idx, e in enumerate(energies):
@@ -484,7 +498,7 @@ def run_ase(params: ASEInputSchema) -> ASEOutputSchema:
                     from ase.thermochemistry import IdealGasThermo
 
                     potentialenergy = atoms.get_potential_energy()
-                    vib_energies = vib.get_energies()
+                    vib_energies = energies
 
                     linear = is_linear_molecule.invoke({"atomsdata": final_structure})
                     symmetrynumber = get_symmetry_number.invoke(
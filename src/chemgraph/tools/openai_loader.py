@@ -12,12 +12,40 @@ from chemgraph.utils.logging_config import setup_logger
 logger = setup_logger(__name__)
 
 
+def openai_client_kwargs(http_async_client=None, max_retries: int = None) -> dict:
+    """Return the optional ChatOpenAI client arguments that were actually set.
+
+    Older langchain-openai releases declare ``max_retries: int`` and reject an explicit
+    None, so unset options are left out and ChatOpenAI keeps its own defaults.
+
+    Parameters
+    ----------
+    http_async_client : httpx.AsyncClient, optional
+        Shared client used for asynchronous requests, by default None
+    max_retries : int, optional
+        Number of retries of a failed API request, by default None
+
+    Returns
+    -------
+    dict
+        Keyword arguments to pass to ChatOpenAI.
+    """
+    kwargs = {}
+    if http_async_client is not None:
+        kwargs["http_async_client"] = http_async_client
+    if max_retries is not None:
+        kwargs["max_retries"] = max_retries
+    return kwargs
+
+
 def load_openai_model(
     model_name: str,
     temperature: float,
     api_key: str = None,
     prompt: str = None,
     base_url: str = None,
+    http_async_client=None,
+    max_retries: int = None,
 ) -> ChatOpenAI:
     """Load an OpenAI chat model into LangChain.
 
@@ -39,6 +67,14 @@ def load_openai_model(
         from the environment variable `OPENAI_API_KEY`.
     prompt : str, optional
         Custom prompt to use when requesting the API key from the user.
+    base_url : str, optional
+        Base URL of an OpenAI-compatible endpoint, by default None
+    http_async_client : httpx.AsyncClient, optional
+        Shared client used for asynchronous requests, so that concurrent workflows
+        reuse pooled connections, by default None
+    max_retries : int, optional
+        Number of times a failed API request (rate limit, connection error, 5xx) is
+        retried with exponential backoff, by default None (the OpenAI client default)
 
     Returns
     -------
@@ -82,6 +118,7 @@ def load_openai_model(
                 temperature=temperature,
                 api_key=api_key,
                 base_url=base_url,
+                **openai_client_kwargs(http_async_client, max_retries),
                 max_tokens=4000,
                 top_p=1.0,
                 frequency_penalty=0.0,
@@ -93,6 +130,7 @@ def load_openai_model(
                 model=model_name,
                 temperature=temperature,
                 api_key=api_key,
+                **openai_client_kwargs(http_async_client, max_retries),
                 max_tokens=6000,
             )
         # No guarantee that api_key is valid, authentication happens only during invocation
@@ -106,7 +144,15 @@ def load_openai_model(
             api_key = getpass("Please enter a valid OpenAI API key: ")
             os.environ["OPENAI_API_KEY"] = api_key
             # Retry with new API key
-            return load_openai_model(model_name, temperature, api_key, prompt)
+            return load_openai_model(
+                model_name,
+                temperature,
+                api_key,
+                prompt,
+                base_url=base_url,
+                http_async_client=http_async_client,
+                max_retries=max_retries,
+            )
         else:
             logger.error(f"Error loading OpenAI model: {str(e)}")
             raise
@@ -1,7 +1,12 @@
 import logging
+import logging.handlers
+import queue
 import sys
 
 
+_LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
 def setup_logger(name=None, level=logging.INFO):
     """Set up a logger with consistent formatting.
 
@@ -33,11 +38,42 @@ def setup_logger(name=None, level=logging.INFO):
 
     if not logger.handlers:  # Only add handler if none exists
         handler = logging.StreamHandler(sys.stdout)
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        )
+        formatter = logging.Formatter(_LOG_FORMAT)
         handler.setFormatter(formatter)
         logger.addHandler(handler)
 
     logger.setLevel(level)
     return logger
+
+
+def setup_queue_logger(name=None, level=logging.INFO):
+    """Set up a logger that hands records to a background thread for output.
+
+    The logger only enqueues records, and a ``QueueListener`` thread writes them
+    to stdout. This keeps logging I/O out of asyncio event loops and ensures that
+    records from concurrent tasks are not interleaved.
+
+    Parameters
+    ----------
+    name : str, optional
+        Logger name. If None, configures the root logger, by default None
+    level : int, optional
+        Logging level (e.g., logging.INFO, logging.DEBUG), by default logging.INFO
+
+    Returns
+    -------
+    tuple[logging.Logger, logging.handlers.QueueListener]
+        Configured logger and its started listener. Call ``listener.stop()`` on
+        shutdown to flush the remaining records.
+    """
+    log_queue = queue.Queue(-1)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter(_LOG_FORMAT))
+    listener = logging.handlers.QueueListener(log_queue, handler)
+
+    logger = logging.getLogger(name)
+    logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+    logger.setLevel(level)
+    logger.propagate = False
+    listener.start()
+    return logger, listener
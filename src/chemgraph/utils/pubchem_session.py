@@ -0,0 +1,97 @@
+"""Route PubChemPy requests through a shared, connection-pooling HTTP session.
+
+PubChemPy opens every request with ``urllib.request.urlopen``, which sets up a
+new TCP/TLS connection each time. Batch scripts that issue many lookups can call
+:func:`use_shared_pubchem_session` once to reuse connections across requests.
+"""
+
+import io
+import os
+import socket
+import ssl
+from urllib.error import HTTPError
+
+import pubchempy
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_session = None
+
+
+def get_pubchem_session() -> requests.Session:
+    """Return the process-wide session used for PubChem requests.
+
+    Returns
+    -------
+    requests.Session
+        Session with a pooled adapter that retries transient server errors.
+    """
+    global _session
+    if _session is None:
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            # PUG-REST lookups sent as POST are read-only and safe to retry.
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _session = session
+    return _session
+
+
+def _verify_option(context=None, cafile=None, capath=None):
+    """Translate ``urlopen``'s TLS arguments into a ``requests`` ``verify`` value."""
+    if context is not None and context.verify_mode == ssl.CERT_NONE:
+        return False
+    if cafile or capath:
+        return cafile or capath
+    # PubChemPy builds its context from PUBCHEMPY_CA_BUNDLE, else REQUESTS_CA_BUNDLE
+    # or certifi, which requests already uses by default.
+    if context is not None and os.getenv("PUBCHEMPY_CA_BUNDLE"):
+        return os.getenv("PUBCHEMPY_CA_BUNDLE")
+    return True
+
+
+def _session_urlopen(url, data=None, timeout=None, *, context=None, cafile=None, capath=None):
+    """Drop-in replacement for ``urllib.request.urlopen`` as used by ``pubchempy.request``.
+
+    Accepts the full ``urlopen`` signature, since PubChemPy versions differ in the
+    arguments they pass (1.0.5 passes an SSL ``context``). The certificate checks the
+    context asks for are applied through ``requests``' ``verify`` option.
+    """
+    if not isinstance(timeout, (int, float)):
+        # urlopen's default (a sentinel, or None) means the global socket timeout.
+        timeout = socket.getdefaulttimeout()
+    session = get_pubchem_session()
+    verify = _verify_option(context, cafile, capath)
+    if data is None:
+        response = session.get(url, timeout=timeout, verify=verify)
+    else:
+        response = session.post(
+            url,
+            data=data,
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            timeout=timeout,
+            verify=verify,
+        )
+    if response.status_code >= 400:
+        # pubchempy.request converts HTTPError into its own exception hierarchy.
+        raise HTTPError(
+            url,
+            response.status_code,
+            response.reason,
+            response.headers,
+            io.BytesIO(response.content),
+        )
+    return io.BytesIO(response.content)
+
+
+def use_shared_pubchem_session() -> None:
+    """Make all PubChemPy requests in this process use the shared session."""
+    pubchempy.urlopen = _session_urlopen
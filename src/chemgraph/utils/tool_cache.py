@@ -0,0 +1,260 @@
+"""Cached wrappers around cheminformatics tools for batch evaluation workflows.
+
+The evaluation scripts look up the same species (water, oxygen, CO2, ...) in
+many reactions and molecule sets, and are rerun many times during dataset
+curation. These helpers memoize the PubChem name lookup, the RDKit structure
+generation and ASE thermochemistry in memory and in an SQLite file, so that
+repeated runs, and parallel worker processes, only compute new species.
+
+The cache lives in ``~/.chemgraph_cache`` unless the ``CHEMGRAPH_CACHE_DIR``
+environment variable points elsewhere. Entries are keyed on ``CACHE_VERSION``
+and on the versions of the libraries that produced them (RDKit for structures;
+ASE and the calculator packages for thermochemistry), so upgrading any of them
+invalidates the affected results.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import sqlite3
+
+from chemgraph.models.ase_input import ASEInputSchema
+from chemgraph.models.atomsdata import AtomsData
+from chemgraph.tools.ase_tools import run_ase
+from chemgraph.tools.cheminformatics_tools import (
+    molecule_name_to_smiles,
+    smiles_to_atomsdata,
+)
+
+# Bump to invalidate existing cache files when the cache layout or keys change.
+# 2: structures are keyed on the exact SMILES instead of the canonical SMILES.
+CACHE_VERSION = 2
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.getenv("CHEMGRAPH_CACHE_DIR", os.path.expanduser("~/.chemgraph_cache")),
+    "tool_cache.sqlite",
+)
+
+_atomsdata_cache: dict = {}
+
+
+class _ResultCache:
+    """Minimal JSON key-value store backed by SQLite.
+
+    SQLite handles locking between processes, so a single cache file can be
+    shared by the workers of a process pool.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "namespace TEXT, key TEXT, value TEXT, PRIMARY KEY (namespace, key))"
+            )
+
+    def _connect(self):
+        return contextlib.closing(sqlite3.connect(self.path, timeout=60))
+
+    def get(self, namespace: str, key: str):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM cache WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def set(self, namespace: str, key: str, value) -> None:
+        with self._connect() as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value) VALUES (?, ?, ?)",
+                (namespace, key, json.dumps(value)),
+            )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_result_cache(path: str) -> _ResultCache:
+    return _ResultCache(path)
+
+
+def _make_key(*parts) -> str:
+    return json.dumps([CACHE_VERSION, *parts], sort_keys=True)
+
+
+@functools.lru_cache(maxsize=4096)
+def cached_molecule_name_to_smiles(name: str, cache_path: str = DEFAULT_CACHE_PATH) -> str:
+    """Convert a molecule name to SMILES, memoizing the PubChem lookup.
+
+    Parameters
+    ----------
+    name : str
+        The name of the molecule to convert.
+    cache_path : str, optional
+        Path to the SQLite cache file, by default DEFAULT_CACHE_PATH.
+
+    Returns
+    -------
+    str
+        The SMILES string representation of the molecule.
+    """
+    cache = _get_result_cache(cache_path)
+    key = _make_key(name)
+    smiles = cache.get("name_to_smiles", key)
+    if smiles is None:
+        smiles = molecule_name_to_smiles.invoke({"name": name})
+        cache.set("name_to_smiles", key, smiles)
+    return smiles
+
+
+def canonicalize_smiles(smiles: str) -> str:
+    """Return the RDKit canonical form of a SMILES string.
+
+    Parameters
+    ----------
+    smiles : str
+        SMILES string to canonicalize.
+
+    Returns
+    -------
+    str
+        Canonical SMILES, or the input unchanged if RDKit cannot parse it.
+    """
+    from rdkit import Chem
+
+    mol = Chem.MolFromSmiles(smiles)
+    if mol is None:
+        return smiles
+    return Chem.MolToSmiles(mol)
+
+
+def cached_smiles_to_atomsdata(
+    smiles: str, cache_path: str = DEFAULT_CACHE_PATH
+) -> AtomsData:
+    """Convert a SMILES string to AtomsData, memoized on the exact SMILES string.
+
+    Equivalent spellings of a molecule (e.g. ``CCO`` and ``OCC``) embed to
+    different atom orders, so they are cached separately. A cached result always
+    equals an uncached ``smiles_to_atomsdata`` call on the same input.
+
+    Parameters
+    ----------
+    smiles : str
+        SMILES string representation of the molecule.
+    cache_path : str, optional
+        Path to the SQLite cache file, by default DEFAULT_CACHE_PATH.
+
+    Returns
+    -------
+    AtomsData
+        A deep copy of the cached structure, safe for callers to mutate.
+    """
+    import rdkit
+
+    memory_key = (cache_path, smiles)
+    atomsdata = _atomsdata_cache.get(memory_key)
+    if atomsdata is None:
+        cache = _get_result_cache(cache_path)
+        key = _make_key(smiles, rdkit.__version__)
+        cached = cache.get("smiles_to_atomsdata", key)
+        if cached is not None:
+            atomsdata = AtomsData(**cached)
+        else:
+            atomsdata = smiles_to_atomsdata.invoke({"smiles": smiles})
+            cache.set("smiles_to_atomsdata", key, atomsdata.model_dump())
+        _atomsdata_cache[memory_key] = atomsdata
+    return atomsdata.model_copy(deep=True)
+
+
+# Python packages whose version can change a calculator's results, by calculator type.
+_CALCULATOR_PACKAGES = {
+    "tblite": ("tblite",),
+    "mace": ("mace-torch", "torch"),
+    "fairchem": ("fairchem-core", "torch"),
+}
+
+
+def _package_versions(calculator_type: str) -> dict:
+    """Return the installed versions of ASE and the packages behind a calculator."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    packages = ["ase"]
+    for name, extra in _CALCULATOR_PACKAGES.items():
+        if name in calculator_type.lower():
+            packages.extend(extra)
+
+    versions = {}
+    for package in packages:
+        try:
+            versions[package] = version(package)
+        except PackageNotFoundError:
+            versions[package] = None
+    return versions
+
+
+def cached_thermochemistry(
+    smiles: str,
+    calculator: dict,
+    temperature: float,
+    pressure: float = 101325.0,
+    cache_path: str = DEFAULT_CACHE_PATH,
+) -> dict:
+    """Run an ASE thermochemistry calculation, persisting results on disk.
+
+    Results are keyed on the canonical SMILES, so equivalent spellings of a
+    molecule share one result since thermochemistry does not depend on atom
+    order. The key also covers everything else that affects the result: the full
+    calculator parameters (including defaults), temperature, pressure, the
+    optimizer settings and the versions of ASE and of the calculator's packages
+    (TBLite, MACE, FAIRChem). Failed calculations are not cached.
+
+    Parameters
+    ----------
+    smiles : str
+        SMILES string representation of the molecule.
+    calculator : dict
+        ASE calculator parameters, e.g. ``{"calculator_type": "mace_mp"}``.
+    temperature : float
+        Temperature in Kelvin.
+    pressure : float, optional
+        Pressure in Pascal, by default 101325.0.
+    cache_path : str, optional
+        Path to the SQLite cache file, by default DEFAULT_CACHE_PATH.
+
+    Returns
+    -------
+    dict
+        Thermochemistry data as returned in ``ASEOutputSchema.thermochemistry``.
+    """
+    params = ASEInputSchema(
+        atomsdata=cached_smiles_to_atomsdata(smiles, cache_path=cache_path),
+        driver="thermo",
+        calculator=calculator,
+        temperature=temperature,
+        pressure=pressure,
+    )
+    calculator_params = params.calculator.model_dump(mode="json")
+
+    cache = _get_result_cache(cache_path)
+    key = _make_key(
+        canonicalize_smiles(smiles),
+        calculator_params,
+        "thermo",
+        temperature,
+        pressure,
+        params.optimizer,
+        params.fmax,
+        params.steps,
+        _package_versions(calculator_params.get("calculator_type", "")),
+    )
+    thermochemistry = cache.get("thermo", key)
+    if thermochemistry is not None:
+        return thermochemistry
+
+    aseoutput = run_ase.invoke({"params": params})
+    if aseoutput.success:
+        cache.set("thermo", key, aseoutput.thermochemistry)
+    return aseoutput.thermochemistry
@@ -0,0 +1,72 @@
+"""Per-workflow working directories for tools that write files.
+
+Workflows that run concurrently in one process share a single current working
+directory, so calculator input/output files with fixed names (e.g. NWChem's
+``nwchem.nwi``) would overwrite each other. Code that runs workflows concurrently
+can wrap each one in :func:`working_directory`; tools then resolve relative paths
+against that directory instead of the process cwd.
+
+The directory is held in a context variable, so it follows asyncio tasks and the
+worker threads LangChain/LangGraph start through their context-copying executors.
+"""
+
+import contextlib
+import contextvars
+import os
+
+_working_directory = contextvars.ContextVar("chemgraph_working_directory", default=None)
+
+
+def get_working_directory():
+    """Return the working directory of the current workflow.
+
+    Returns
+    -------
+    str or None
+        Absolute path set by :func:`working_directory`, or None if tools should use
+        the process cwd.
+    """
+    return _working_directory.get()
+
+
+@contextlib.contextmanager
+def working_directory(path: str):
+    """Run the enclosed workflow with tool files written under ``path``.
+
+    Parameters
+    ----------
+    path : str
+        Directory for the workflow's files. Created if it does not exist.
+
+    Yields
+    ------
+    str
+        The absolute path of the directory.
+    """
+    path = os.path.abspath(path)
+    os.makedirs(path, exist_ok=True)
+    token = _working_directory.set(path)
+    try:
+        yield path
+    finally:
+        _working_directory.reset(token)
+
+
+def resolve_path(path: str) -> str:
+    """Resolve a relative path against the current workflow's working directory.
+
+    Parameters
+    ----------
+    path : str
+        File or directory path.
+
+    Returns
+    -------
+    str
+        ``path`` joined to the working directory, or ``path`` unchanged if it is
+        absolute or no working directory is set.
+    """
+    directory = get_working_directory()
+    if directory is None or os.path.isabs(path):
+        return path
+    return os.path.join(directory, path)
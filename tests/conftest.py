@@ -1,24 +1,17 @@
 import pytest
-import warnings
 from ase import Atoms
 
 # Configure pytest-asyncio
 #pytest_plugins = ("pytest_asyncio",)
 
 
-@pytest.fixture(autouse=True)
-def setup_test_env():
-    """Setup any test environment variables or configurations needed"""
-    # Filter numpy deprecation warnings
-    warnings.filterwarnings(
-        "ignore",
-        message="In future, it will be an error for 'np.bool_' scalars to be interpreted as an index",
-        category=DeprecationWarning,
-    )
-    pass
+@pytest.fixture(scope="session")
+def _h2_template():
+    """Session-wide H2 molecule; read-only, request simple_h2_molecule to modify it"""
+    return Atoms("H2", positions=[[0, 0, 0], [0, 0, 1]])
 
 
 @pytest.fixture
-def simple_h2_molecule():
+def simple_h2_molecule(_h2_template):
     """Fixture providing a simple H2 molecule for testing"""
-    return Atoms("H2", positions=[[0, 0, 0], [0, 0, 1]])
+    return _h2_template.copy()
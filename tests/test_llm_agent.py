@@ -1,6 +1,7 @@
+import asyncio
 import pytest
 from chemgraph.agent.llm_agent import ChemGraph
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from langchain_core.messages import HumanMessage, AIMessage
 
 
@@ -30,3 +31,35 @@ def test_agent_query(mock_llm):
         assert response.content == "Test response"
         mock_llm.bind_tools.assert_called_once()
         mock_chain.invoke.assert_called_once()
+
+
+def test_agent_query_async(mock_llm):
+    with patch("chemgraph.agent.llm_agent.load_openai_model") as mock_load:
+        mock_chain = Mock()
+        mock_chain.ainvoke = AsyncMock(return_value=AIMessage(content="Test response"))
+        mock_llm.bind_tools.return_value = mock_chain
+        mock_load.return_value = mock_llm
+
+        agent = ChemGraph(model_name="gpt-4o-mini")
+        response = asyncio.run(agent.arun("What is the SMILES string for water?"))
+        assert isinstance(response, AIMessage)
+        assert response.content == "Test response"
+        # arun awaits the model's async client instead of calling it from a thread.
+        mock_chain.ainvoke.assert_awaited_once()
+        mock_chain.invoke.assert_not_called()
+
+
+def test_load_openai_model_defaults():
+    from langchain_openai import ChatOpenAI
+    from chemgraph.tools.openai_loader import load_openai_model
+
+    # Unset client options must not be forwarded as None; older langchain-openai
+    # releases reject max_retries=None.
+    llm = load_openai_model(model_name="gpt-4o-mini", temperature=0.0, api_key="test-key")
+    assert isinstance(llm, ChatOpenAI)
+    assert isinstance(llm.max_retries, int)
+
+    llm = load_openai_model(
+        model_name="gpt-4o-mini", temperature=0.0, api_key="test-key", max_retries=5
+    )
+    assert llm.max_retries == 5
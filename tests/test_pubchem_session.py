@@ -0,0 +1,49 @@
+import json
+from unittest.mock import Mock
+
+import pubchempy
+import pytest
+
+from chemgraph.utils import pubchem_session
+
+
+def _response(status_code, payload):
+    response = Mock()
+    response.status_code = status_code
+    response.reason = "OK" if status_code < 400 else "Not Found"
+    response.headers = {}
+    response.content = json.dumps(payload).encode()
+    return response
+
+
+@pytest.fixture
+def mock_session(monkeypatch):
+    """Install the shared session with a mocked requests.Session behind it."""
+    session = Mock()
+    monkeypatch.setattr(pubchem_session, "_session", session)
+    monkeypatch.setattr(pubchempy, "urlopen", pubchempy.urlopen)
+    pubchem_session.use_shared_pubchem_session()
+    return session
+
+
+def test_pubchem_request_uses_shared_session(mock_session):
+    payload = {"IdentifierList": {"CID": [962]}}
+    mock_session.post.return_value = _response(200, payload)
+
+    response = pubchempy.request("water", "name", operation="cids")
+
+    assert json.loads(response.read()) == payload
+    mock_session.post.assert_called_once()
+    args, kwargs = mock_session.post.call_args
+    assert args[0].endswith("/compound/name/cids/JSON")
+    assert kwargs["data"] == b"name=water"
+    # PubChemPy's SSL context verifies certificates, so the session must too.
+    assert kwargs["verify"] is not False
+
+
+def test_pubchem_request_http_error(mock_session):
+    fault = {"Fault": {"Code": "PUGREST.NotFound", "Message": "No CID found"}}
+    mock_session.post.return_value = _response(404, fault)
+
+    with pytest.raises(pubchempy.NotFoundError):
+        pubchempy.request("not-a-molecule", "name", operation="cids")
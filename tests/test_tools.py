@@ -1,6 +1,7 @@
 import pytest
 from chemgraph.tools.ase_tools import (
     run_ase,
+    save_atomsdata_to_file,
     get_symmetry_number,
     is_linear_molecule,
 )
@@ -9,6 +10,12 @@ from chemgraph.tools.cheminformatics_tools import (
     molecule_name_to_smiles,
 )
 from chemgraph.models.atomsdata import AtomsData
+from chemgraph.utils import tool_cache
+from chemgraph.utils.tool_cache import (
+    cached_smiles_to_atomsdata,
+    cached_thermochemistry,
+)
+from chemgraph.utils.working_directory import working_directory
 from chemgraph.models.ase_input import ASEOutputSchema, ASEInputSchema
 
 
@@ -38,6 +45,27 @@ def test_smiles_to_atomsdata():
         smiles_to_atomsdata.invoke({"smiles": "invalid_smiles"})
 
 
+def test_cached_smiles_to_atomsdata(tmp_path):
+    cache_path = str(tmp_path / "tool_cache.sqlite")
+    ethanol = cached_smiles_to_atomsdata("CCO", cache_path=cache_path)
+    assert isinstance(ethanol, AtomsData)
+    assert cached_smiles_to_atomsdata("CCO", cache_path=cache_path) == ethanol
+    # Equivalent spellings get the structure embedded from their own SMILES
+    assert cached_smiles_to_atomsdata("OCC", cache_path=cache_path) == smiles_to_atomsdata.invoke(
+        {"smiles": "OCC"}
+    )
+
+    # Mutating a returned copy does not affect the cache
+    ethanol.positions[0][0] += 1.0
+    assert cached_smiles_to_atomsdata("CCO", cache_path=cache_path) != ethanol
+
+    # Structures persist on disk across processes
+    tool_cache._atomsdata_cache.clear()
+    assert cached_smiles_to_atomsdata("CCO", cache_path=cache_path) == smiles_to_atomsdata.invoke(
+        {"smiles": "CCO"}
+    )
+
+
 @pytest.fixture
 def water_atomsdata():
     """Fixture for water atomsdata"""
@@ -157,6 +185,36 @@ def test_run_ase_vib(vib_ase_schema):
     assert len(result.vibrational_frequencies) > 0
 
 
+def test_run_ase_vib_concurrent(vib_ase_schema, tmp_path, monkeypatch):
+    """Test that concurrent vibrational analyses do not share displacement files."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    monkeypatch.chdir(tmp_path)
+    expected = run_ase.invoke({"params": vib_ase_schema.model_copy(deep=True)})
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(
+            executor.map(
+                lambda _: run_ase.invoke({"params": vib_ase_schema.model_copy(deep=True)}),
+                range(4),
+            )
+        )
+    for result in results:
+        assert result.success
+        assert result.vibrational_frequencies == expected.vibrational_frequencies
+    # No displacement cache is left behind in the working directory
+    assert not (tmp_path / "vib").exists()
+
+
+def test_working_directory(water_atomsdata, tmp_path, monkeypatch):
+    """Test that tools write relative paths under the workflow's working directory."""
+    monkeypatch.chdir(tmp_path)
+    with working_directory("workflow_0") as directory:
+        save_atomsdata_to_file.invoke({"atomsdata": water_atomsdata, "fname": "water.xyz"})
+    assert directory == str(tmp_path / "workflow_0")
+    assert (tmp_path / "workflow_0" / "water.xyz").exists()
+    assert not (tmp_path / "water.xyz").exists()
+
+
 def test_run_ase_thermo(thermo_ase_schema):
     """Test ASE thermochemistry calculation."""
     result = run_ase.invoke({"params": thermo_ase_schema})
@@ -178,3 +236,16 @@ def test_run_ase_thermo(thermo_ase_schema):
     assert "frequencies" in result.vibrational_frequencies
     assert "frequency_unit" in result.vibrational_frequencies
     assert result.vibrational_frequencies["frequency_unit"] == "cm-1"
+
+
+def test_cached_thermochemistry(tmp_path):
+    """Test that thermochemistry results are persisted and reused."""
+    cache_path = str(tmp_path / "tool_cache.sqlite")
+    calculator = {"calculator_type": "EMTCalc"}
+    thermo = cached_thermochemistry("O", calculator, 298, cache_path=cache_path)
+    assert "enthalpy" in thermo
+    # Equivalent SMILES hit the same cache entry
+    assert cached_thermochemistry("[H]O[H]", calculator, 298, cache_path=cache_path) == thermo
+    # Conditions that change the result are part of the key
+    high_pressure = cached_thermochemistry("O", calculator, 298, pressure=2e5, cache_path=cache_path)
+    assert high_pressure["entropy"] != thermo["entropy"]